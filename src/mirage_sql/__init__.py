@@ -18,19 +18,66 @@ def get_global_manager() -> MirageManager:
     return _GLOBAL_MANAGER
 
 @overload
-def mirror(collection: List) -> MirageList: ...
+def mirror(collection: List, manager:Optional[MirageManager]=None,
+           index:Optional[List[Union[str, List[str]]]]=None,
+           spatial:Optional[List[str]]=None,
+           searchable:Optional[List[str]]=None,
+           columns:Optional[List[str]]=None,
+           exclude:Optional[List[str]]=None) -> MirageList: ...
 
 @overload
-def mirror(collection: Dict) -> MirageDict: ...
+def mirror(collection: Dict, manager:Optional[MirageManager]=None,
+           index:Optional[List[Union[str, List[str]]]]=None,
+           spatial:Optional[List[str]]=None,
+           searchable:Optional[List[str]]=None,
+           columns:Optional[List[str]]=None,
+           exclude:Optional[List[str]]=None) -> MirageDict: ...
 
-def mirror(collection: Union[List, Dict], manager:Optional[MirageManager]=None):
+def mirror(collection: Union[List, Dict], manager:Optional[MirageManager]=None,
+           index:Optional[List[Union[str, List[str]]]]=None,
+           spatial:Optional[List[str]]=None,
+           searchable:Optional[List[str]]=None,
+           columns:Optional[List[str]]=None,
+           exclude:Optional[List[str]]=None):
+    """
+        mirror wraps a list or dict so it can be queried with SQL
+        Params:
+            collection: non-empty list or dict of objects
+            manager: MirageManager to use, defaults to the global one
+            index: columns to index, e.g. ["age", "-score", ["city", "age"]]
+                   a nested list makes a composite index, '-' makes it DESC
+            spatial: coordinate columns kept in an R*Tree, e.g. ["x", "y"],
+                     enables .within(bbox) and .nearest(point, k)
+            searchable: string columns kept in an FTS5 index, enables .search(term)
+            columns: only store these attributes in SQL (others stay readable via the proxy)
+            exclude: store every attribute except these
+                     spatial/searchable/index columns are always stored
+        Returns: MirageList or MirageDict
+    """
     if not collection:
         raise ValueError("Collection cannot be empty for inference.")
     
     actual_manager = manager or get_global_manager()
+
+    required = list(spatial or []) + list(searchable or [])
+    for keys in index or []:
+        required += [k.lstrip('-') for k in ([keys] if isinstance(keys, str) else keys) if k.lstrip('-') != "key_val"]
+    if columns is not None:
+        columns = list(columns) + [c for c in required if c not in columns]
+    if exclude is not None:
+        exclude = [c for c in exclude if c not in required]
     
     if isinstance(collection, dict):
-        return MirageDict(collection, actual_manager)
-    return MirageList(collection, actual_manager)
+        mirrored = MirageDict(collection, actual_manager, columns, exclude)
+    else:
+        mirrored = MirageList(collection, actual_manager, columns, exclude)
+
+    if spatial:
+        actual_manager.add_spatial_index(mirrored.table_name, spatial)
+    if searchable:
+        actual_manager.add_search_index(mirrored.table_name, searchable)
+    for keys in index or []:
+        mirrored.create_index(*([keys] if isinstance(keys, str) else keys))
+    return mirrored
 
 __all__ = ["mirror"]
@@ -1,18 +1,20 @@
-
+import weakref
 from collections import UserList, UserDict
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional, Union
 
 from .proxy import MirageProxy
 
 class MirageList(UserList):
-    def __init__(self, initlist:List, manager):
+    def __init__(self, initlist:List, manager, columns:Optional[List[str]]=None, exclude:Optional[List[str]]=None):
         if not initlist:
             raise ValueError("MirageList requires at least one item for type inference.")
 
         self.manager = manager 
         first_item = initlist[0]
         self.allowed_type:type = type(getattr(first_item, '_target', first_item))
-        self.table_name:str = self.manager.register_type(first_item)
+        self.table_name:str = self.manager.register_type(first_item, columns, exclude)
+        self.collection_id:int = self.manager.new_collection_id()
+        weakref.finalize(self, manager.release_collection, self.table_name, self.collection_id)
 
 
         # Keep a strong reference to the raw objects. otherwise it is cleaned up to early
@@ -21,7 +23,7 @@ class MirageList(UserList):
         super().__init__([MirageProxy(obj, manager) for obj in initlist])
         
         for obj in initlist:
-            self.manager.sync_object(obj, is_new=True)
+            self.manager.sync_object(obj, is_new=True, collection_id=self.collection_id)
 
 
 
@@ -38,11 +40,12 @@ class MirageList(UserList):
         # 1. Type Enforcement (Optional but recommended)
         real_item = getattr(item, '_target', item)
 
-        # Keep it alive
-        self._items.append(real_item)
-
         if not isinstance(real_item, self.allowed_type):
             raise TypeError(f"Expected {self.allowed_type.__name__}, got {type(real_item).__name__}")
+        self.manager.check_owner(self.table_name, real_item, self.collection_id)
+
+        # Keep it alive
+        self._items.append(real_item)
 
         # 2. Check if it's already a proxy
         if isinstance(item, MirageProxy):
@@ -53,11 +56,70 @@ class MirageList(UserList):
             proxy = MirageProxy(item, self.manager)
 
         super().append(proxy)
-        self.manager.sync_object(item, is_new=True)
+        self.manager.sync_object(item, is_new=True, collection_id=self.collection_id)
+
+    def query(self, where: str = "1=1", order_by: Union[str, List[str], None] = None,
+              limit: Optional[int] = None) -> List[Any]:
+        """
+        Filter (and optionally sort / cap) the collection in SQL.
+        Example: players.query("level > 5", order_by=["-score", "name"], limit=50)
+        """
+        ptrs = self.manager.select_ptrs(self.table_name, where, order_by, limit, self.collection_id)
+        return [MirageProxy(self.manager.lookup(ptr), self.manager) for ptr in ptrs]
+
+    def first(self, where: str = "1=1", order_by: Union[str, List[str], None] = None) -> Optional[Any]:
+        """Returns the first match (by order_by) or None."""
+        results = self.query(where, order_by=order_by, limit=1)
+        return results[0] if results else None
+
+    def create_index(self, *keys: str) -> str:
+        """
+        Index one or more columns; prefix a key with '-' for a DESC index.
+        Example: players.create_index("-score") makes query(order_by="-score", limit=50) index-backed.
+        """
+        return self.manager.create_index(self.table_name, keys)
 
-    def query(self, where: str) -> List[Any]:
-        cursor = self.manager.conn.execute(f"SELECT obj_ptr FROM {self.table_name} WHERE {where}")
-        return [MirageProxy(self.manager._registry[row['obj_ptr']], self.manager) for row in cursor.fetchall()]
+    def within(self, bbox: List[float], where: str = "1=1") -> List[Any]:
+        """
+        Items whose spatial coordinates fall inside bbox (mins then maxes).
+        Example: units.within((0, 0, 10, 10), where="team = 'red'")
+        """
+        ptrs = self.manager.select_within(self.table_name, bbox, where, self.collection_id)
+        return [MirageProxy(self.manager.lookup(ptr), self.manager) for ptr in ptrs]
+
+    def nearest(self, point: List[float], k: int = 1, where: str = "1=1") -> List[Any]:
+        """
+        The k items closest to point, nearest first.
+        Example: units.nearest((5, 5), k=3)
+        """
+        ptrs = self.manager.select_nearest(self.table_name, point, k, where, self.collection_id)
+        return [MirageProxy(self.manager.lookup(ptr), self.manager) for ptr in ptrs]
+
+    def search(self, term: str, where: str = "1=1", rank: bool = False, limit: Optional[int] = None) -> List[Any]:
+        """
+        Full-text search over the searchable columns.
+        Example: users.search("smith", where="age > 30", rank=True, limit=20)
+        """
+        ptrs = self.manager.select_search(self.table_name, term, where, rank, limit, self.collection_id)
+        return [MirageProxy(self.manager.lookup(ptr), self.manager) for ptr in ptrs]
+
+    def aggregate(self, select: str, where: str = "1=1") -> Any:
+        """
+        Run an aggregate over this collection only.
+        Example: players.aggregate("AVG(score)", where="level > 5")
+        """
+        where, params = self.manager._scope(where, self.collection_id)
+        return self.manager.resolve(f'SELECT {select} FROM "{self.table_name}" WHERE {where}', tuple(params))[0]
+
+    def count_where(self, where: str = "1=1") -> int:
+        """Number of rows in this collection matching where (len() counts everything)."""
+        return self.aggregate("COUNT(*)", where)
+
+    def drop(self):
+        """Removes the whole collection from SQL in one DELETE and empties it."""
+        self.manager.drop_collection(self.table_name, self.collection_id)
+        self.data.clear()
+        self._items.clear()
     
     def pop(self, index=-1):
         # 1. Get the proxy object at that index
@@ -72,56 +134,142 @@ class MirageList(UserList):
     def join(self, other_list: 'MirageList', on: str, where: str = "1=1") -> List:
         """
         Join this list with another MirageList.
-        Example: players.join(items, "players.id = items.owner_id")
+        Each side is referred to by its table name; when both lists mirror the same
+        class the right side is called "other".
+        Example: players.join(items, "player.id = item.owner_id")
+                 red.join(blue, "player.score = other.score")
         """
-        # 1. Construct the SELECT to get the ptrs from both tables
-        select_clause = f"{self.table_name}.obj_ptr as self_ptr, {other_list.table_name}.obj_ptr as right_ptr"
+        left = self.table_name
+        right = other_list.table_name if other_list.table_name != left else "other"
+
+        # 1. Construct the SELECT to get the ptrs from both sides
+        select_clause = f'"{left}".obj_ptr as self_ptr, "{right}".obj_ptr as right_ptr'
         
-        # 2. Construct the FROM/JOIN clause
+        # 2. Construct the FROM/JOIN clause, each alias confined to its own collection
         # Note: We use double quotes for table names to be safe
-        query = (f'SELECT {select_clause} FROM "{self.table_name}" '
-                f'JOIN "{other_list.table_name}" ON {on} '
-                f'WHERE {where}')
+        query = (f'SELECT {select_clause} FROM "{self.table_name}" AS "{left}" '
+                f'JOIN "{other_list.table_name}" AS "{right}" ON {on} '
+                f'WHERE "{left}".collection_id = ? AND "{right}".collection_id = ? '
+                f'AND ({where})')
         
-        cursor = self.manager.conn.execute(query)
+        rows = self.manager.cached_rows([self.table_name, other_list.table_name], query,
+                                        (self.collection_id, other_list.collection_id))
         
         # 3. Re-materialize the Python objects
         final_results = []
-        for row in cursor.fetchall():
-            self_ptr, right_ptr = row['self_ptr'], row['right_ptr']
-            right_obj = MirageProxy(self.manager._registry[right_ptr], self.manager)
-            self_obj = MirageProxy(self.manager._registry[self_ptr], self.manager)
+        for self_ptr, right_ptr in rows:
+            right_obj = MirageProxy(self.manager.lookup(right_ptr), self.manager)
+            self_obj = MirageProxy(self.manager.lookup(self_ptr), self.manager)
             final_results.append((self_obj, right_obj))
             
         return final_results
     
 
 class MirageDict(UserDict):
-    def __init__(self, initdict:Dict, manager):
+    def __init__(self, initdict:Dict, manager, columns:Optional[List[str]]=None, exclude:Optional[List[str]]=None):
         if not initdict:
             raise ValueError("MirageDict requires at least one item for type inference.")
         
         self.manager = manager
 
-        # Keep a strong reference to the raw values
-        self._items = {k: getattr(v, '_target', v) for k, v in initdict.items()}
+        # Keep a strong reference to the raw values (filled in by __setitem__)
+        self._items = {}
 
         _, first_val = next(iter(initdict.items()))
-        self.table_name = self.manager.register_type(first_val)
+        self.table_name = self.manager.register_type(first_val, columns, exclude)
+        self.collection_id = self.manager.new_collection_id()
+        weakref.finalize(self, manager.release_collection, self.table_name, self.collection_id)
         self.allowed_type = type(getattr(first_val, '_target', first_val))
 
-        super().__init__({k: MirageProxy(v, manager) for k, v in initdict.items()})
-        for k, v in initdict.items():
-            self.manager.sync_object(v, key_val=k, is_new=True)
+        # UserDict.__init__ routes every pair through __setitem__, which syncs it
+        super().__init__(initdict)
 
 
     def __setitem__(self, key, value):
-        proxy = MirageProxy(value, self.manager)
-        super().__setitem__(key, proxy)
-        self._items[key] = value
-        self.manager.sync_object(value, key_val=key, is_new=True)
-
-    def query(self, where: str) -> List[Any]:
-        # 'key_val' is the special column for dict keys
-        cursor = self.manager.conn.execute(f"SELECT obj_ptr FROM {self.table_name} WHERE {where}")
-        return [MirageProxy(self.manager._registry[row['obj_ptr']], self.manager) for row in cursor.fetchall()]
+        real_value = getattr(value, '_target', value)
+        self.manager.check_owner(self.table_name, real_value, self.collection_id, key)
+
+        # Rebinding a key: the old value leaves the SQL index (and frees the unique key slot)
+        old_value = self._items.get(key)
+        if old_value is not None and old_value is not real_value:
+            self.manager.remove_object(self.table_name, old_value)
+
+        super().__setitem__(key, MirageProxy(real_value, self.manager))
+        self._items[key] = real_value
+        self.manager.sync_object(real_value, key_val=key, is_new=True, collection_id=self.collection_id)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.manager.remove_object(self.table_name, self._items.pop(key))
+
+    def keys_between(self, low: Any, high: Any) -> List[Any]:
+        """
+        Keys in [low, high], ascending, via the key index.
+        Example: registry.keys_between(1000, 1999)
+        """
+        return self.manager.select_keys(self.table_name, low, high, self.collection_id)
+
+    def query(self, where: str = "1=1", order_by: Union[str, List[str], None] = None,
+              limit: Optional[int] = None) -> List[Any]:
+        """
+        Filter (and optionally sort / cap) the values in SQL.
+        'key_val' is the special column for dict keys; it keeps the key's type and is indexed,
+        so predicates like "key_val = 42 AND level > 5" start from the key index.
+        Example: party.query("key_val LIKE 'h%'", order_by="-level", limit=10)
+        """
+        ptrs = self.manager.select_ptrs(self.table_name, where, order_by, limit, self.collection_id)
+        return [MirageProxy(self.manager.lookup(ptr), self.manager) for ptr in ptrs]
+
+    def first(self, where: str = "1=1", order_by: Union[str, List[str], None] = None) -> Optional[Any]:
+        """Returns the first match (by order_by) or None."""
+        results = self.query(where, order_by=order_by, limit=1)
+        return results[0] if results else None
+
+    def create_index(self, *keys: str) -> str:
+        """
+        Index one or more columns; prefix a key with '-' for a DESC index.
+        Example: party.create_index("-level") makes query(order_by="-level", limit=10) index-backed.
+        """
+        return self.manager.create_index(self.table_name, keys)
+
+    def within(self, bbox: List[float], where: str = "1=1") -> List[Any]:
+        """
+        Items whose spatial coordinates fall inside bbox (mins then maxes).
+        Example: squads.within((0, 0, 10, 10), where="team = 'red'")
+        """
+        ptrs = self.manager.select_within(self.table_name, bbox, where, self.collection_id)
+        return [MirageProxy(self.manager.lookup(ptr), self.manager) for ptr in ptrs]
+
+    def nearest(self, point: List[float], k: int = 1, where: str = "1=1") -> List[Any]:
+        """
+        The k items closest to point, nearest first.
+        Example: squads.nearest((5, 5), k=3)
+        """
+        ptrs = self.manager.select_nearest(self.table_name, point, k, where, self.collection_id)
+        return [MirageProxy(self.manager.lookup(ptr), self.manager) for ptr in ptrs]
+
+    def search(self, term: str, where: str = "1=1", rank: bool = False, limit: Optional[int] = None) -> List[Any]:
+        """
+        Full-text search over the searchable columns.
+        Example: registry.search("smith", where="age > 30", rank=True, limit=20)
+        """
+        ptrs = self.manager.select_search(self.table_name, term, where, rank, limit, self.collection_id)
+        return [MirageProxy(self.manager.lookup(ptr), self.manager) for ptr in ptrs]
+
+    def aggregate(self, select: str, where: str = "1=1") -> Any:
+        """
+        Run an aggregate over this collection only.
+        Example: party.aggregate("MAX(level)", where="key_val != 'tank'")
+        """
+        where, params = self.manager._scope(where, self.collection_id)
+        return self.manager.resolve(f'SELECT {select} FROM "{self.table_name}" WHERE {where}', tuple(params))[0]
+
+    def count_where(self, where: str = "1=1") -> int:
+        """Number of rows in this collection matching where (len() counts everything)."""
+        return self.aggregate("COUNT(*)", where)
+
+    def drop(self):
+        """Removes the whole collection from SQL in one DELETE and empties it."""
+        self.manager.drop_collection(self.table_name, self.collection_id)
+        self.data.clear()
+        self._items.clear()
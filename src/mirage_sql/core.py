@@ -1,8 +1,10 @@
+import math
+import operator
 import sqlite3
 import weakref
-from collections import UserList, UserDict
+from collections import OrderedDict, UserList, UserDict, namedtuple
 from dataclasses import is_dataclass, fields
-from typing import Any, Iterable, Union, List, Dict, overload
+from typing import Any, Iterable, Optional, Union, List, Dict, overload
 
 from .proxy import MirageProxy
 from .collections import MirageDict, MirageList
@@ -14,15 +16,69 @@ def get_sqlite_type(value: Any) -> str:
     return "TEXT"
 
 
+def _key_param(key: Any) -> Any:
+    """
+    Dict keys are stored natively. Keys SQLite can't hold (tuples, enums, datetimes...) are
+    stored as NULL rather than str()-ed (which could collide): the entry is still mirrored,
+    it just can't be matched through key_val.
+    """
+    if key is None or isinstance(key, (int, float, str, bytes)):
+        return key
+    return None
+
+
+def _discover_columns(obj: Any) -> List[str]:
+    """Public attribute names for a dataclass, namedtuple, attrs or slotted object."""
+    cls = type(obj)
+    if is_dataclass(obj):
+        return [f.name for f in fields(obj)]
+    if isinstance(obj, tuple) and hasattr(cls, '_fields'):
+        return list(cls._fields)
+    if hasattr(cls, '__attrs_attrs__'):
+        return [a.name for a in cls.__attrs_attrs__ if not a.name.startswith('_')]
+
+    cols = []
+    # __slots__ can be spread across the MRO, and a class may mix slots with a __dict__
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        cols.extend(s for s in slots if s not in cols)
+    if hasattr(obj, '__dict__'):
+        cols.extend(k for k in vars(obj) if k not in cols)
+    return [c for c in cols if not c.startswith('_')]
+
+
+_MAX_NEAREST_ROUNDS = 128
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
 
 class MirageManager:
     """Handles the SQLite connection and schema inference."""
-    def __init__(self, sample_obj: Any=None):
+    def __init__(self, sample_obj: Any=None, cache_size: int=0):
         self.conn = sqlite3.connect(":memory:")
         self.conn.row_factory = sqlite3.Row
         self._registry = weakref.WeakValueDictionary()
+        # Objects that can't be weakly referenced (namedtuples, slots without __weakref__).
+        # Held until removed, dropped, or their collection is garbage collected (release_collection)
+        self._pinned = {}
+        self._extractors = {} # Format: {"classname": attrgetter over all columns}
+        self._column_sets = {} # Format: {"classname": {"col1", "col2"}}, for fast "is this mirrored?" checks
         self._in_transaction = False
         self.tables = {} # Format: {"classname": ["col1", "col2", ...]}
+        self.spatial = {} # Format: {"classname": ["x", "y"]}, backed by an R*Tree "classname_rtree"
+        self._spatial_bounds = {} # Format: {"classname": [[min_x, min_y], [max_x, max_y]]}, only ever grows
+        self.searchable = {} # Format: {"classname": ["name", "bio"]}, backed by an FTS5 table "classname_fts"
+        self._last_collection_id = 0
+        self._live_collections = set() # collection ids whose MirageList/MirageDict is still alive
+
+        # Opt-in LRU of query results. Entries are validated against per-table version counters
+        self.cache_size = cache_size
+        self._versions = {} # Format: {"classname": writes_so_far}
+        self._cache = OrderedDict() # Format: {(tables, sql, params): (tables_read, their_versions, rows)}
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     def _get_table_name(self, obj: Any) -> str:
         """Determines the table name (lowercase class name)."""
@@ -30,59 +86,497 @@ class MirageManager:
         real_obj = getattr(obj, '_target', obj)
         return real_obj.__class__.__name__.lower()
 
-    def register_type(self, obj: Any):
-        """Creates a table for the object's class if it doesn't exist."""
+    def register_type(self, obj: Any, columns: Optional[Iterable[str]] = None,
+                      exclude: Optional[Iterable[str]] = None):
+        """
+        Creates a table for the object's class, or widens it if this collection
+        needs columns the table doesn't have yet.
+        columns/exclude narrow which attributes are stored (default: all of them);
+        unmirrored attributes are still readable through the proxy but never written to SQL.
+        """
 
         real_obj = obj
         while hasattr(real_obj, '_target'):
             real_obj = real_obj._target
         table_name = self._get_table_name(real_obj)
         
+        # Infer columns (dataclass, namedtuple, attrs, __slots__ or standard object)
+        cols = _discover_columns(real_obj)
+        unknown = [c for c in list(columns or []) + list(exclude or []) if c not in cols]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown} for {type(real_obj).__name__}")
+        if columns is not None:
+            cols = [c for c in cols if c in columns]
+        if exclude is not None:
+            cols = [c for c in cols if c not in exclude]
+
         if table_name in self.tables:
-            return table_name # Already exists
-        
-        # Infer columns (dataclass or standard object)
-        if is_dataclass(real_obj):
-            cols = [f.name for f in fields(real_obj)]
-        else:
-            cols = [k for k in vars(real_obj).keys() if not k.startswith('_')]
-        
-        self.tables[table_name] = cols
+            # Another collection asked for more columns than the table has
+            self._add_columns(table_name, [c for c in cols if c not in self._column_sets[table_name]])
+            return table_name
+        self._set_columns(table_name, cols)
         
-        # Build the CREATE TABLE query
-        col_defs = [f'"{c}" TEXT' for c in cols]
+        # Build the CREATE TABLE query. Columns are untyped (no affinity) so every value keeps
+        # its native type and ORDER BY / indexes compare numbers as numbers, whatever the sample holds
+        col_defs = [f'"{c}"' for c in cols]
         if len(col_defs) == 0:
             raise Exception("incorrect col_defs")
-        query = f'CREATE TABLE IF NOT EXISTS "{table_name}" (obj_ptr INTEGER PRIMARY KEY, key_val TEXT, {", ".join(col_defs)} )'
+        query = (f'CREATE TABLE IF NOT EXISTS "{table_name}" '
+                 f'(obj_ptr INTEGER PRIMARY KEY, collection_id INTEGER, key_val, {", ".join(col_defs)} )')
         self.conn.execute(query)
+        # Every mirrored collection of this class shares the table; queries are scoped by collection_id.
+        # list rows leave key_val NULL (NULLs never collide)
+        self.conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "idx_{table_name}_collection_key" '
+                          f'ON "{table_name}" (collection_id, key_val)')
         return table_name
+
+    def _set_columns(self, table_name: str, cols: List[str]):
+        self.tables[table_name] = cols
+        self._column_sets[table_name] = set(cols)
+        self._extractors[table_name] = operator.attrgetter(*cols) if cols else None
+
+    def _add_columns(self, table_name: str, new_cols: List[str]):
+        """Widens an existing table and backfills the new columns from the live objects."""
+        if not new_cols:
+            return
+        for c in new_cols:
+            self.conn.execute(f'ALTER TABLE "{table_name}" ADD COLUMN "{c}"')
+        self._set_columns(table_name, self.tables[table_name] + new_cols)
+
+        assignments = ", ".join(f'"{c}" = ?' for c in new_cols)
+        for ptr, in self.conn.execute(f'SELECT obj_ptr FROM "{table_name}"').fetchall():
+            obj = self._registry.get(ptr)
+            if obj is None:
+                obj = self._pinned.get(ptr)
+            if obj is not None:
+                self.conn.execute(f'UPDATE "{table_name}" SET {assignments} WHERE obj_ptr = ?',
+                                  [getattr(obj, c, None) for c in new_cols] + [ptr])
+        self.conn.commit()
+        self._bump_version(table_name)
+
+    def is_mirrored(self, obj: Any, attr: str) -> bool:
+        """Whether writing attr on obj needs a sync (True for types not registered yet)."""
+        col_set = self._column_sets.get(self._get_table_name(obj))
+        return col_set is None or attr in col_set
+
+    def new_collection_id(self) -> int:
+        """Hands out the scope id a mirrored collection tags its rows with."""
+        self._last_collection_id += 1
+        self._live_collections.add(self._last_collection_id)
+        return self._last_collection_id
+
+    def check_owner(self, table_name: str, obj: Any, collection_id: Optional[int], key_val: Any = None):
+        """
+        An object's row belongs to one collection (and one dict key). Raises if obj is already
+        held by another live collection or under another key; rows left behind by a
+        garbage-collected collection can be taken over.
+        """
+        key_val = _key_param(key_val)
+        row = self.conn.execute(f'SELECT collection_id, key_val FROM "{table_name}" WHERE obj_ptr = ?',
+                                (id(getattr(obj, '_target', obj)),)).fetchone()
+        if row is None:
+            return
+        owner, owner_key = row
+        if owner is not None and owner != collection_id and owner in self._live_collections:
+            raise ValueError(f"{type(getattr(obj, '_target', obj)).__name__} object is already mirrored by "
+                             f"another collection; remove it there first")
+        if owner is not None and owner == collection_id and owner_key != key_val:
+            raise ValueError(f"{type(getattr(obj, '_target', obj)).__name__} object is already stored "
+                             f"under key {owner_key!r}")
+
+    def _scope(self, where: str, collection_id: Optional[int], alias: str = "") -> tuple:
+        """Confines a WHERE fragment to one collection (no-op when collection_id is None)."""
+        if collection_id is None:
+            return f"({where})", []
+        return f"{alias}collection_id = ? AND ({where})", [collection_id]
     
 
-    def sync_object(self, obj: Any, key_val: Any = None, is_new: bool = False):
-        # fetch table
-        table_name = self.register_type(obj)
+    def sync_object(self, obj: Any, key_val: Any = None, is_new: Optional[bool] = None,
+                    collection_id: Optional[int] = None):
+        """
+        Writes the object's row. New rows are tagged with collection_id/key_val (an object
+        lives in one collection at a time, see check_owner); updates only rewrite the
+        attribute columns so the scope and key are preserved.
+        is_new=True inserts, is_new=False only updates an existing row (a no-op once the
+        object was popped/deleted/dropped), None updates or inserts as needed.
+        """
+        # fetch table (registered with every column on first sight)
+        table_name = self._get_table_name(obj)
+        if table_name not in self.tables:
+            self.register_type(obj)
         cols = self.tables[table_name]
 
         # fetch real_object if proxy, real id and data
         real_obj = getattr(obj, '_target', obj)
         ptr = id(real_obj)
-        self._registry[ptr] = real_obj
 
-        attr_values = [getattr(real_obj, c, None) for c in cols]
-        all_values = [ptr, str(key_val) if key_val else None] + attr_values
-        # vals = [ptr, str(key_val) if key_val else None] + [getattr(obj, c, None) for c in self.cols]
-        
-        placeholders = ", ".join(["?"] * len(all_values))
+        attr_values = self._extract_row(table_name, real_obj)
         col_names = ", ".join([f'"{c}"' for c in cols])
-        query = f'INSERT OR REPLACE INTO "{table_name}" (obj_ptr, key_val, {col_names}) VALUES ({placeholders})'
-        self.conn.execute(query, all_values)
+
+        updated = 0
+        if not is_new:
+            assignments = ", ".join(f'"{c}" = ?' for c in cols)
+            updated = self.conn.execute(f'UPDATE "{table_name}" SET {assignments} WHERE obj_ptr = ?',
+                                        attr_values + [ptr]).rowcount
+        if not updated and is_new is False:
+            return
+        if not updated:
+            self._remember(ptr, real_obj)
+            self.check_owner(table_name, real_obj, collection_id, key_val)
+            # Replace only this object's own row; a plain INSERT lets a (collection_id, key_val)
+            # conflict raise instead of silently deleting another row
+            self.conn.execute(f'DELETE FROM "{table_name}" WHERE obj_ptr = ?', (ptr,))
+            all_values = [ptr, collection_id, _key_param(key_val)] + attr_values
+            placeholders = ", ".join(["?"] * len(all_values))
+            query = f'INSERT INTO "{table_name}" (obj_ptr, collection_id, key_val, {col_names}) VALUES ({placeholders})'
+            self.conn.execute(query, all_values)
+        if table_name in self.spatial:
+            self._sync_spatial(table_name, ptr, [attr_values[cols.index(c)] for c in self.spatial[table_name]])
+        if table_name in self.searchable:
+            self._sync_search(table_name, ptr, [attr_values[cols.index(c)] for c in self.searchable[table_name]])
         self.conn.commit()
+        self._bump_version(table_name)
+
+    def _extract_row(self, table_name: str, real_obj: Any) -> List[Any]:
+        """Pull every column value off the object in one attrgetter call."""
+        extractor = self._extractors[table_name]
+        try:
+            values = extractor(real_obj)
+        except AttributeError:
+            # An unset slot (or missing attribute) - fall back to per-column defaults
+            return [getattr(real_obj, c, None) for c in self.tables[table_name]]
+        return [values] if len(self.tables[table_name]) == 1 else list(values)
+
+    def _remember(self, ptr: int, real_obj: Any):
+        try:
+            self._registry[ptr] = real_obj
+        except TypeError:
+            self._pinned[ptr] = real_obj
+
+    def lookup(self, ptr: int) -> Any:
+        """Returns the live object behind an obj_ptr."""
+        obj = self._registry.get(ptr)
+        if obj is None:
+            obj = self._pinned[ptr]
+        return obj
 
     def remove_object(self, table_name:str, obj: Any):
         self.conn.execute(f"DELETE FROM {table_name} WHERE obj_ptr = ?", (id(obj),))
+        if table_name in self.spatial:
+            self.conn.execute(f'DELETE FROM "{table_name}_rtree" WHERE obj_ptr = ?', (id(obj),))
+        if table_name in self.searchable:
+            self.conn.execute(f'DELETE FROM "{table_name}_fts" WHERE rowid = ?', (id(obj),))
+        self._pinned.pop(id(obj), None)
+        self.conn.commit()
+        self._bump_version(table_name)
+
+    def drop_collection(self, table_name: str, collection_id: int):
+        """Deletes every row (and index entry) belonging to one collection."""
+        members = f'SELECT obj_ptr FROM "{table_name}" WHERE collection_id = ?'
+        for ptr, in self.conn.execute(members, (collection_id,)).fetchall():
+            self._pinned.pop(ptr, None)
+        if table_name in self.spatial:
+            self.conn.execute(f'DELETE FROM "{table_name}_rtree" WHERE obj_ptr IN ({members})', (collection_id,))
+        if table_name in self.searchable:
+            self.conn.execute(f'DELETE FROM "{table_name}_fts" WHERE rowid IN ({members})', (collection_id,))
+        self.conn.execute(f'DELETE FROM "{table_name}" WHERE collection_id = ?', (collection_id,))
+        self.conn.commit()
+        self._bump_version(table_name)
+
+    def release_collection(self, table_name: str, collection_id: int):
+        """
+        Called when a collection is garbage collected: lets go of the objects pinned for it.
+        Its rows stay in SQL, like rows of weakly referenced objects do.
+        """
+        self._live_collections.discard(collection_id)
+        if table_name not in self.tables:
+            return
+        members = f'SELECT obj_ptr FROM "{table_name}" WHERE collection_id = ?'
+        for ptr, in self.conn.execute(members, (collection_id,)).fetchall():
+            self._pinned.pop(ptr, None)
+
+    def _bump_version(self, table_name: str):
+        self._versions[table_name] = self._versions.get(table_name, 0) + 1
+
+    def cached_rows(self, tables: Iterable[str], sql: str, params: Iterable[Any] = ()) -> List[tuple]:
+        """
+        Executes a read query, serving it from the result cache while none of
+        the tables it reads (including subqueries in a WHERE) have been written since it was stored.
+        Only writes made through sync_object/remove_object invalidate entries.
+        """
+        if not self.cache_size:
+            return [tuple(row) for row in self.conn.execute(sql, tuple(params)).fetchall()]
+
+        key = (tuple(tables), sql, tuple(params))
+        entry = self._cache.get(key)
+        if entry is not None:
+            read_tables, versions, rows = entry
+            if versions == tuple(self._versions.get(t, 0) for t in read_tables):
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                return list(rows)
+
+        self._cache_misses += 1
+        read_tables = set(key[0])
+
+        def record_reads(action, arg1, arg2, db_name, source):
+            # arg1 is the table name for SQLITE_READ
+            if action == sqlite3.SQLITE_READ and arg1:
+                read_tables.add(self._base_table(arg1))
+            return sqlite3.SQLITE_OK
+
+        # Installing an authorizer expires prepared statements, so this statement is re-prepared and seen
+        self.conn.set_authorizer(record_reads)
+        try:
+            rows = tuple(tuple(row) for row in self.conn.execute(sql, key[2]).fetchall())
+        finally:
+            self.conn.set_authorizer(None)
+
+        read_tables = tuple(sorted(read_tables))
+        self._cache[key] = (read_tables, tuple(self._versions.get(t, 0) for t in read_tables), rows)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return list(rows)
+
+    def _base_table(self, name: str) -> str:
+        """Maps R*Tree/FTS5 tables (and their shadow tables) back to the class table they index."""
+        if name in self.tables:
+            return name
+        for table_name in self.tables:
+            if name.startswith(f"{table_name}_rtree") or name.startswith(f"{table_name}_fts"):
+                return table_name
+        return name
+
+    def cache_info(self) -> CacheInfo:
+        """Hit/miss statistics, shaped like functools.lru_cache's."""
+        return CacheInfo(self._cache_hits, self._cache_misses, self.cache_size, len(self._cache))
+
+    def cache_clear(self):
+        self._cache.clear()
+        self._cache_hits = self._cache_misses = 0
+
+
+
+    def _parse_order_keys(self, table_name: str, order_by: Union[str, Iterable[str]]) -> List[tuple]:
+        """Turns ["-score", "name"] into [("score", "DESC"), ("name", "ASC")]."""
+        if isinstance(order_by, str):
+            order_by = [order_by]
+
+        allowed = set(self.tables[table_name]) | {"obj_ptr", "key_val"}
+        keys = []
+        for key in order_by:
+            col, direction = (key[1:], "DESC") if key.startswith('-') else (key, "ASC")
+            if col not in allowed:
+                raise ValueError(f"Unknown column '{col}' for table '{table_name}'")
+            keys.append((col, direction))
+        return keys
+
+    def create_index(self, table_name: str, order_by: Union[str, Iterable[str]]) -> str:
+        """
+        Creates (or reuses) an index over the given keys.
+        collection_id leads the index so scoped queries can sort straight off it.
+        Example: create_index("player", ["-score", "name"])
+        """
+        keys = self._parse_order_keys(table_name, order_by)
+        index_name = "idx_" + "_".join([table_name] + [f"{c}_{d.lower()}" for c, d in keys])
+        key_defs = ", ".join(["collection_id"] + [f'"{c}" {d}' for c, d in keys])
+        self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" ({key_defs})')
+        self.conn.commit()
+        return index_name
+
+    def select_ptrs(self, table_name: str, where: str = "1=1", order_by: Union[str, Iterable[str], None] = None,
+                    limit: Optional[int] = None, collection_id: Optional[int] = None) -> List[int]:
+        """Runs a filtered/sorted SELECT and returns the matching obj_ptrs."""
+        where, params = self._scope(where, collection_id)
+        query = f'SELECT obj_ptr FROM "{table_name}" WHERE {where}'
+        if order_by:
+            keys = self._parse_order_keys(table_name, order_by)
+            query += " ORDER BY " + ", ".join(f'"{c}" {d}' for c, d in keys)
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [row[0] for row in self.cached_rows([table_name], query, params)]
+
+    def select_keys(self, table_name: str, low: Any, high: Any, collection_id: Optional[int] = None) -> List[Any]:
+        """Dict keys in [low, high], ascending, served by the (collection_id, key_val) index."""
+        where, params = self._scope("key_val BETWEEN ? AND ?", collection_id)
+        query = f'SELECT key_val FROM "{table_name}" WHERE {where} ORDER BY key_val'
+        rows = self.cached_rows([table_name], query, params + [_key_param(low), _key_param(high)])
+        return [row[0] for row in rows]
+
+    def add_spatial_index(self, table_name: str, cols: Iterable[str]):
+        """
+        Maintains an R*Tree over coordinate columns next to the main table.
+        Example: add_spatial_index("unit", ["x", "y"])
+        """
+        cols = list(cols)
+        if table_name in self.spatial:
+            if cols != self.spatial[table_name]:
+                raise ValueError(f"Table '{table_name}' already has a spatial index on {self.spatial[table_name]}")
+            return
+        if not 1 <= len(cols) <= 5:
+            raise ValueError("A spatial index needs between 1 and 5 coordinate columns.")
+        unknown = [c for c in cols if c not in self.tables[table_name]]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown} for table '{table_name}'")
+
+        bounds_defs = ", ".join(f'"min_{c}", "max_{c}"' for c in cols)
+        self.conn.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS "{table_name}_rtree" USING rtree(obj_ptr, {bounds_defs})')
+        self.spatial[table_name] = cols
+
+        # Backfill rows synced before the index existed
+        col_names = ", ".join(f'"{c}"' for c in cols)
+        for row in self.conn.execute(f'SELECT obj_ptr, {col_names} FROM "{table_name}"').fetchall():
+            self._sync_spatial(table_name, row[0], list(row)[1:])
         self.conn.commit()
 
+    def _sync_spatial(self, table_name: str, ptr: int, coords: List[Any]):
+        if any(c is None for c in coords):
+            self.conn.execute(f'DELETE FROM "{table_name}_rtree" WHERE obj_ptr = ?', (ptr,))
+            return
+
+        # A point is a degenerate box: min == max on every axis
+        placeholders = ", ".join(["?"] * (1 + 2 * len(coords)))
+        self.conn.execute(f'INSERT OR REPLACE INTO "{table_name}_rtree" VALUES ({placeholders})',
+                          [ptr] + [c for c in coords for _ in range(2)])
+
+        bounds = self._spatial_bounds.get(table_name)
+        if bounds is None:
+            self._spatial_bounds[table_name] = [list(coords), list(coords)]
+        else:
+            bounds[0] = [min(lo, c) for lo, c in zip(bounds[0], coords)]
+            bounds[1] = [max(hi, c) for hi, c in zip(bounds[1], coords)]
+
+    def _spatial_query(self, table_name: str, lows: List[float], highs: List[float], where: str,
+                       collection_id: Optional[int]) -> tuple:
+        if table_name not in self.spatial:
+            raise ValueError(f"Table '{table_name}' has no spatial index; pass spatial=[...] to mirror().")
+        cols = self.spatial[table_name]
+
+        # The R*Tree stores 32-bit floats (boxes are rounded outwards), so re-check the real columns
+        conds, params = [], []
+        for c, lo, hi in zip(cols, lows, highs):
+            conds.append(f'r."max_{c}" >= ? AND r."min_{c}" <= ? AND t."{c}" BETWEEN ? AND ?')
+            params += [lo, hi, lo, hi]
+
+        where, scope_params = self._scope(where, collection_id, alias="t.")
+        col_names = ", ".join(f't."{c}"' for c in cols)
+        # CROSS JOIN pins the R*Tree as the outer loop
+        query = (f'SELECT t.obj_ptr, {col_names} FROM "{table_name}_rtree" r '
+                 f'CROSS JOIN "{table_name}" t ON t.obj_ptr = r.obj_ptr '
+                 f'WHERE {" AND ".join(conds)} AND {where}')
+        return query, params + scope_params
+
+    def select_within(self, table_name: str, bbox: Iterable[float], where: str = "1=1",
+                      collection_id: Optional[int] = None) -> List[int]:
+        """
+        obj_ptrs whose coordinates fall inside bbox (all mins, then all maxes).
+        Example: select_within("unit", (0, 0, 10, 10))
+        """
+        bbox = list(bbox)
+        dims = len(self.spatial.get(table_name, ()))
+        if dims and len(bbox) != 2 * dims:
+            raise ValueError(f"Expected a bounding box of {2 * dims} values, got {len(bbox)}")
+
+        query, params = self._spatial_query(table_name, bbox[:dims], bbox[dims:], where, collection_id)
+        return [row[0] for row in self.cached_rows([table_name], query, params)]
+
+    def select_nearest(self, table_name: str, point: Iterable[float], k: int = 1, where: str = "1=1",
+                       collection_id: Optional[int] = None) -> List[int]:
+        """
+        The k obj_ptrs closest (euclidean) to point, nearest first.
+        Searches a box around the point that doubles until the k-th hit is provably inside it.
+        """
+        point = list(point)
+        if table_name not in self.spatial:
+            raise ValueError(f"Table '{table_name}' has no spatial index; pass spatial=[...] to mirror().")
+        if len(point) != len(self.spatial[table_name]):
+            raise ValueError(f"Expected a point with {len(self.spatial[table_name])} coordinates")
+        if not all(math.isfinite(c) for c in point):
+            raise ValueError(f"Point coordinates must be finite, got {point}")
+        bounds = self._spatial_bounds.get(table_name)
+        if k <= 0 or bounds is None:
+            return []
+
+        span = max(hi - lo for lo, hi in zip(*bounds)) or 1.0
+        radius = span / 1024
+        # Doubling from span/1024 covers any finite extent long before this; the cap guards odd data (inf/nan)
+        for _ in range(_MAX_NEAREST_ROUNDS):
+            lows = [c - radius for c in point]
+            highs = [c + radius for c in point]
+            query, params = self._spatial_query(table_name, lows, highs, where, collection_id)
+            hits = sorted((math.dist(point, row[1:]), row[0]) for row in self.conn.execute(query, params))
+
+            # Anything outside the box is further than radius, so a k-th hit within radius is final
+            covers_all = all(lo <= b_lo and hi >= b_hi for lo, hi, b_lo, b_hi in zip(lows, highs, *bounds))
+            if (len(hits) >= k and hits[k - 1][0] <= radius) or covers_all:
+                return [ptr for _, ptr in hits[:k]]
+            radius *= 2
+        return [ptr for _, ptr in hits[:k]]
+
+    def add_search_index(self, table_name: str, cols: Iterable[str], tokenize: str = "trigram"):
+        """
+        Maintains an FTS5 index over string columns, keyed by obj_ptr.
+        The default trigram tokenizer matches substrings, like LIKE '%term%'.
+        Example: add_search_index("user", ["name"])
+        """
+        cols = list(cols)
+        if table_name in self.searchable:
+            if cols != self.searchable[table_name]:
+                raise ValueError(f"Table '{table_name}' already has a search index on {self.searchable[table_name]}")
+            return
+        unknown = [c for c in cols if c not in self.tables[table_name]]
+        if not cols or unknown:
+            raise ValueError(f"Unknown columns {unknown or cols} for table '{table_name}'")
+
+        col_names = ", ".join(f'"{c}"' for c in cols)
+        self.conn.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS "{table_name}_fts" USING fts5({col_names}, tokenize="{tokenize}")')
+        self.searchable[table_name] = cols
+
+        # Backfill rows synced before the index existed
+        self.conn.execute(f'INSERT INTO "{table_name}_fts" (rowid, {col_names}) SELECT obj_ptr, {col_names} FROM "{table_name}"')
+        self.conn.commit()
+
+    def _sync_search(self, table_name: str, ptr: int, values: List[Any]):
+        # FTS5 has no upsert, so replace the document
+        col_names = ", ".join(f'"{c}"' for c in self.searchable[table_name])
+        placeholders = ", ".join(["?"] * (1 + len(values)))
+        self.conn.execute(f'DELETE FROM "{table_name}_fts" WHERE rowid = ?', (ptr,))
+        self.conn.execute(f'INSERT INTO "{table_name}_fts" (rowid, {col_names}) VALUES ({placeholders})', [ptr] + values)
+
+    def select_search(self, table_name: str, term: str, where: str = "1=1", rank: bool = False,
+                      limit: Optional[int] = None, collection_id: Optional[int] = None) -> List[int]:
+        """
+        obj_ptrs whose searchable columns contain term (matched as a literal phrase).
+        rank=True orders by bm25 relevance, best first. Terms under 3 characters can't use
+        the trigram index and are answered by a substring scan, unranked (rank is ignored).
+        """
+        if table_name not in self.searchable:
+            raise ValueError(f"Table '{table_name}' has no search index; pass searchable=[...] to mirror().")
+        fts_name = f"{table_name}_fts"
+        where, scope_params = self._scope(where, collection_id, alias="t.")
+
+        if len(term) < 3:
+            # Trigrams can't index terms this short; fall back to a substring scan
+            conds = " OR ".join(f'instr(lower(t."{c}"), lower(?)) > 0' for c in self.searchable[table_name])
+            query = f'SELECT t.obj_ptr FROM "{table_name}" t WHERE ({conds}) AND {where}'
+            params = [term] * len(self.searchable[table_name]) + scope_params
+        else:
+            # Match in a subquery so only the base table's columns are visible to the WHERE
+            # (the FTS5 columns share their names); CROSS JOIN keeps the match as the outer loop
+            query = (f'SELECT t.obj_ptr FROM (SELECT rowid AS fts_rowid, rank AS fts_rank FROM "{fts_name}" '
+                     f'WHERE "{fts_name}" MATCH ?) m CROSS JOIN "{table_name}" t ON t.obj_ptr = m.fts_rowid '
+                     f'WHERE {where}')
+            params = ['"' + term.replace('"', '""') + '"'] + scope_params
+            if rank:
+                query += ' ORDER BY m.fts_rank'
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
 
+        return [row[0] for row in self.cached_rows([table_name], query, params)]
 
     def join_query(self, select_cols: str, tables: List[str], where: str) -> List[tuple]:
         """
@@ -103,7 +597,7 @@ class MirageManager:
         for row in rows:
             # Convert the row of ptrs into a tuple of Proxies
             result_tuple = tuple(
-                MirageProxy(self._registry[ptr], self) for ptr in row
+                MirageProxy(self.lookup(ptr), self) for ptr in row
             )
             results.append(result_tuple)
             
@@ -125,6 +619,8 @@ class MirageManager:
                 # 2. Check if this specific column is a pointer
                 if 'ptr' in col_name.lower() and val is not None:
                     raw_obj = self._registry.get(val)
+                    if raw_obj is None:
+                        raw_obj = self._pinned.get(val)
                     # Wrap in proxy if found, otherwise keep the ID (or None)
                     processed_row.append(MirageProxy(raw_obj, self) if raw_obj else val)
                 else:
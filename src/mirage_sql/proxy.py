@@ -14,8 +14,10 @@ class MirageProxy:
 
     def __setattr__(self, name: str, value: Any):
         setattr(self._target, name, value)
-        if not self._manager._in_transaction:
-            self._manager.sync_object(self._target)
+        # Attributes left out of the mirror are pass-through: nothing to write to SQL
+        if not self._manager._in_transaction and self._manager.is_mirrored(self._target, name):
+            # is_new=False: an object already removed from its collection must not come back
+            self._manager.sync_object(self._target, is_new=False)
 
     def __getattr__(self, name: str):
         return getattr(self._target, name)
@@ -0,0 +1,102 @@
+import pytest
+from dataclasses import dataclass
+from mirage_sql import mirror
+from mirage_sql.core import MirageManager
+
+
+@dataclass
+class Player:
+    id: int
+    name: str
+    score: int
+
+
+@dataclass
+class Item:
+    name: str
+    owner_id: int
+
+
+@pytest.fixture
+def mgr():
+    return MirageManager(cache_size=8)
+
+
+def test_cache_is_off_by_default():
+    mgr = MirageManager()
+    db = mirror([Player(1, "Alice", 100)], manager=mgr)
+
+    db.query("score > 50")
+    db.query("score > 50")
+    assert mgr.cache_info() == (0, 0, 0, 0)
+
+
+def test_repeated_query_hits_cache(mgr):
+    db = mirror([Player(1, "Alice", 100), Player(2, "Bob", 200)], manager=mgr)
+
+    first = db.query("score > 150")
+    second = db.query("score > 150")
+
+    assert [p.name for p in first] == [p.name for p in second] == ["Bob"]
+    info = mgr.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_proxy_write_invalidates(mgr):
+    db = mirror([Player(1, "Alice", 100), Player(2, "Bob", 200)], manager=mgr)
+    assert len(db.query("score > 150")) == 1
+
+    db[0].score = 500
+    assert len(db.query("score > 150")) == 2
+
+    db.pop(1)
+    assert [p.name for p in db.query("score > 150")] == ["Alice"]
+    assert mgr.cache_info().hits == 0
+
+
+def test_join_invalidated_by_either_table(mgr):
+    players = mirror([Player(1, "Alice", 100)], manager=mgr)
+    items = mirror([Item("Stick", 1)], manager=mgr)
+
+    assert len(players.join(items, "player.id = item.owner_id")) == 1
+    assert len(players.join(items, "player.id = item.owner_id")) == 1
+    assert mgr.cache_info().hits == 1
+
+    items[0].owner_id = 99
+    assert len(players.join(items, "player.id = item.owner_id")) == 0
+
+
+def test_cache_is_bounded():
+    mgr = MirageManager(cache_size=2)
+    db = mirror([Player(1, "Alice", 100)], manager=mgr)
+
+    for threshold in range(5):
+        db.query(f"score > {threshold}")
+    assert mgr.cache_info().currsize == 2
+
+    # the oldest entry was evicted, the newest is still there
+    db.query("score > 4")
+    db.query("score > 0")
+    assert mgr.cache_info().hits == 1
+
+    mgr.cache_clear()
+    assert mgr.cache_info() == (0, 0, 2, 0)
+
+
+def test_subquery_table_invalidates(mgr):
+    players = mirror([Player(1, "A", 10), Player(2, "B", 20)], manager=mgr)
+    items = mirror([Item("Stick", 1)], manager=mgr)
+
+    assert [p.name for p in players.query("id IN (SELECT owner_id FROM item)")] == ["A"]
+    items[0].owner_id = 2
+    assert [p.name for p in players.query("id IN (SELECT owner_id FROM item)")] == ["B"]
+    assert mgr.cache_info().hits == 0
+
+
+def test_cached_rows_returns_a_copy(mgr):
+    mirror([Player(1, "A", 10)], manager=mgr)
+
+    rows = mgr.cached_rows(["player"], "SELECT name FROM player")
+    rows.append(("injected",))
+    assert mgr.cached_rows(["player"], "SELECT name FROM player") == [("A",)]
+    assert mgr.cache_info().hits == 1
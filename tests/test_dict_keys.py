@@ -0,0 +1,99 @@
+import pytest
+from dataclasses import dataclass
+from mirage_sql import mirror
+from mirage_sql.core import MirageManager
+
+
+@dataclass
+class Hero:
+    name: str
+    level: int
+
+
+@pytest.fixture
+def mgr():
+    return MirageManager()
+
+
+def test_falsy_and_integer_keys_are_kept(mgr):
+    registry = mirror({0: Hero("Zero", 1), 1: Hero("One", 2), 10: Hero("Ten", 3)}, manager=mgr)
+
+    assert [h.name for h in registry.query("key_val = 0")] == ["Zero"]
+    # keys are INTEGER, so they sort numerically
+    assert [h.name for h in registry.query(order_by="key_val")] == ["Zero", "One", "Ten"]
+    assert mgr.conn.execute("SELECT typeof(key_val) FROM hero WHERE key_val = 10").fetchone()[0] == "integer"
+
+
+def test_keys_between(mgr):
+    registry = mirror({i: Hero(f"h{i}", i) for i in range(100)}, manager=mgr)
+    mirror({i: Hero(f"other{i}", i) for i in range(100)}, manager=mgr)
+
+    assert registry.keys_between(10, 14) == [10, 11, 12, 13, 14]
+    assert registry.keys_between(500, 600) == []
+
+
+def test_string_keys(mgr):
+    party = mirror({"tank": Hero("Arthur", 5), "healer": Hero("Gwen", 10)}, manager=mgr)
+
+    assert party.keys_between("a", "m") == ["healer"]
+    assert [h.name for h in party.query("key_val = 'healer' AND level > 5")] == ["Gwen"]
+
+
+def test_key_lookup_uses_index(mgr):
+    party = mirror({"tank": Hero("Arthur", 5), "healer": Hero("Gwen", 10)}, manager=mgr)
+
+    plan = mgr.conn.execute("EXPLAIN QUERY PLAN SELECT obj_ptr FROM hero WHERE collection_id = ? AND "
+                            "(key_val = 'healer' AND level > 5)", (party.collection_id,)).fetchall()
+    assert "idx_hero_collection_key" in " ".join(row["detail"] for row in plan)
+
+
+def test_rebinding_and_deleting_keys(mgr):
+    party = mirror({"tank": Hero("Arthur", 5)}, manager=mgr, searchable=["name"])
+
+    party["tank"] = Hero("Lancelot", 8)
+    assert [h.name for h in party.query("key_val = 'tank'")] == ["Lancelot"]
+    assert party.search("Arthur") == []
+    assert party.count_where() == 1
+
+    del party["tank"]
+    assert party.count_where() == 0
+    assert "tank" not in party
+
+
+def test_proxy_write_keeps_key(mgr):
+    party = mirror({7: Hero("Arthur", 5)}, manager=mgr)
+
+    party[7].level = 6
+    assert [h.level for h in party.query("key_val = 7")] == [6]
+
+
+def test_non_native_keys_are_stored_as_null(mgr):
+    a, b, c = Hero("A", 1), Hero("B", 2), Hero("C", 3)
+
+    # the tuple key must not collide with its str() form
+    registry = mirror({(1, 2): a, "(1, 2)": b}, manager=mgr)
+    assert len(registry) == registry.count_where() == 2
+    assert [h.name for h in registry.query("key_val = '(1, 2)'")] == ["B"]
+    assert [h.name for h in registry.query("key_val IS NULL")] == ["A"]
+
+    registry[(3, 4)] = c
+    registry[(3, 4)].level = 30
+    assert len(registry) == registry.count_where() == 3
+    assert [h.name for h in registry.query("level > 10")] == ["C"]
+
+    del registry[(1, 2)]
+    assert sorted(h.name for h in registry.query()) == ["B", "C"]
+
+
+def test_same_object_under_two_keys_raises(mgr):
+    hero = Hero("Arthur", 5)
+    party = mirror({"tank": hero}, manager=mgr)
+
+    with pytest.raises(ValueError):
+        party["healer"] = hero
+    assert list(party) == ["tank"]
+    assert [h.name for h in party.query("key_val = 'tank'")] == ["Arthur"]
+
+    # re-binding the same object to its own key is fine
+    party["tank"] = hero
+    assert party.count_where() == 1
@@ -49,5 +49,4 @@ def test_manager_updates_correct_table():
     mgr.sync_object(bob)
     
     res = mgr.conn.execute("SELECT age FROM user WHERE name='Bob'").fetchone()
-    # TODO Fix this
-    assert res['age'] == "26"
\ No newline at end of file
+    assert res['age'] == 26
\ No newline at end of file
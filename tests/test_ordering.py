@@ -0,0 +1,83 @@
+import pytest
+from dataclasses import dataclass
+from mirage_sql import mirror
+from mirage_sql.core import MirageManager
+
+
+@dataclass
+class Racer:
+    name: str
+    score: int
+    team: str
+
+
+@pytest.fixture
+def racers():
+    return [
+        Racer("Alice", 900, "red"),
+        Racer("Bob", 1000, "blue"),
+        Racer("Charlie", 95, "red"),
+        Racer("Dana", 1000, "red"),
+    ]
+
+
+def test_order_by_is_numeric(racers):
+    """Scores keep their native type, so 1000 sorts above 900 (not lexically)."""
+    db = mirror(racers, manager=MirageManager())
+
+    names = [r.name for r in db.query(order_by=["score", "name"])]
+    assert names == ["Charlie", "Alice", "Bob", "Dana"]
+
+
+def test_order_by_when_sample_value_is_none():
+    db = mirror([Racer("Alice", None, "red"), Racer("Bob", 10, "red"), Racer("Carl", 9, "red")],
+                manager=MirageManager())
+
+    assert [r.score for r in db.query(order_by="score")] == [None, 9, 10]
+
+
+def test_order_by_multiple_keys_and_limit(racers):
+    db = mirror(racers, manager=MirageManager())
+
+    top = db.query(order_by=["-score", "name"], limit=3)
+    assert [r.name for r in top] == ["Bob", "Dana", "Alice"]
+
+    reds = db.query("team = 'red'", order_by="-score", limit=2)
+    assert [r.name for r in reds] == ["Dana", "Alice"]
+
+
+def test_first(racers):
+    db = mirror(racers, manager=MirageManager())
+
+    assert db.first(order_by="score").name == "Charlie"
+    assert db.first("team = 'green'") is None
+
+
+def test_order_by_unknown_column_raises(racers):
+    db = mirror(racers, manager=MirageManager())
+
+    with pytest.raises(ValueError):
+        db.query(order_by="-score; DROP TABLE racer")
+
+
+def test_top_k_uses_index(racers):
+    mgr = MirageManager()
+    db = mirror(racers, manager=mgr, index=["-score"])
+
+    plan = mgr.conn.execute('EXPLAIN QUERY PLAN SELECT obj_ptr FROM "racer" WHERE collection_id = ? '
+                            'ORDER BY "score" DESC LIMIT 2', (db.collection_id,)).fetchall()
+    detail = " ".join(row["detail"] for row in plan)
+    assert "idx_racer_score_desc" in detail
+    assert "TEMP B-TREE" not in detail
+
+    assert [r.name for r in db.query(order_by="-score", limit=1)] in (["Bob"], ["Dana"])
+
+
+def test_dict_order_by():
+    party = mirror({
+        "tank": Racer("Arthur", 5, "red"),
+        "healer": Racer("Gwen", 10, "red"),
+    }, manager=MirageManager())
+
+    assert party.first(order_by="-score").name == "Gwen"
+    assert [r.name for r in party.query(order_by="key_val")] == ["Gwen", "Arthur"]
@@ -0,0 +1,87 @@
+import pytest
+from dataclasses import dataclass, field
+from mirage_sql import mirror
+from mirage_sql.core import MirageManager
+
+
+@dataclass
+class Account:
+    name: str
+    level: int
+    bio: str = ""
+    history: list = field(default_factory=list)
+
+
+def test_only_selected_columns_are_stored():
+    mgr = MirageManager()
+    db = mirror([Account("Alice", 3), Account("Bob", 7)], manager=mgr, columns=["name", "level"])
+
+    assert mgr.tables["account"] == ["name", "level"]
+    cols = [row["name"] for row in mgr.conn.execute("PRAGMA table_info(account)")]
+    assert "bio" not in cols and "history" not in cols
+
+    assert [a.name for a in db.query("level > 5")] == ["Bob"]
+
+
+def test_exclude():
+    mgr = MirageManager()
+    mirror([Account("Alice", 3)], manager=mgr, exclude=["history"])
+
+    assert mgr.tables["account"] == ["name", "level", "bio"]
+
+
+def test_unmirrored_write_skips_sync():
+    mgr = MirageManager()
+    db = mirror([Account("Alice", 3)], manager=mgr, columns=["name", "level"])
+    version = mgr._versions["account"]
+
+    db[0].bio = "hello"
+    db[0].history = ["joined"]
+    assert mgr._versions["account"] == version
+    # pass-through read still comes from the Python object
+    assert db[0].bio == "hello"
+
+    db[0].level = 4
+    assert mgr._versions["account"] == version + 1
+    assert [a.name for a in db.query("level = 4")] == ["Alice"]
+
+
+def test_required_columns_are_kept():
+    mgr = MirageManager()
+    mirror([Account("Alice", 3, "likes chess")], manager=mgr, columns=["name"], searchable=["bio"], index=["-level"])
+
+    assert mgr.tables["account"] == ["name", "level", "bio"]
+
+
+def test_unknown_column_raises():
+    with pytest.raises(ValueError):
+        mirror([Account("Alice", 3)], manager=MirageManager(), columns=["nickname"])
+    with pytest.raises(ValueError):
+        mirror([Account("Alice", 3)], manager=MirageManager(), exclude=["nickname"])
+
+
+def test_second_mirror_widens_table():
+    mgr = MirageManager()
+    narrow = mirror([Account("Alice", 3, "chess")], manager=mgr, columns=["name"])
+    wide = mirror([Account("Bob", 7, "go")], manager=mgr, columns=["name", "bio"])
+
+    assert mgr.tables["account"] == ["name", "bio"]
+    # rows synced before the widening are backfilled from the live objects
+    assert [a.name for a in narrow.query("bio = 'chess'")] == ["Alice"]
+    assert [a.name for a in wide.query("bio = 'go'")] == ["Bob"]
+
+
+def test_default_mirror_after_narrow_one_gets_all_columns():
+    @dataclass
+    class Member:
+        name: str
+        age: int
+
+    mgr = MirageManager()
+    narrow = mirror([Member("Alice", 30)], manager=mgr, columns=["name"])
+    full = mirror([Member("Bob", 40)], manager=mgr)
+
+    assert mgr.tables["member"] == ["name", "age"]
+    assert [m.name for m in full.query("age > 0")] == ["Bob"]
+    # the narrow collection's rows were backfilled when the table widened
+    assert [m.name for m in narrow.query("age = 30")] == ["Alice"]
@@ -0,0 +1,120 @@
+import pytest
+from collections import namedtuple
+from mirage_sql import mirror
+from mirage_sql.core import MirageManager
+
+
+class SlottedPlayer:
+    __slots__ = ("name", "score")
+
+    def __init__(self, name, score):
+        self.name = name
+        self.score = score
+
+
+class SlottedHero(SlottedPlayer):
+    __slots__ = ("level", "_secret")
+
+    def __init__(self, name, score, level):
+        super().__init__(name, score)
+        self.level = level
+        self._secret = "hidden"
+
+
+Point = namedtuple("Point", ["label", "x", "y"])
+
+
+class FakeAttribute:
+    def __init__(self, name):
+        self.name = name
+
+
+class AttrsLike:
+    """Mimics what attrs generates, without depending on the attrs package."""
+    __attrs_attrs__ = (FakeAttribute("title"), FakeAttribute("price"))
+
+    def __init__(self, title, price):
+        self.title = title
+        self.price = price
+        self.cache = {}
+
+
+def test_slotted_class_is_mirrored():
+    mgr = MirageManager()
+    players = mirror([SlottedPlayer("Alice", 100), SlottedPlayer("Bob", 200)], manager=mgr)
+
+    assert mgr.tables["slottedplayer"] == ["name", "score"]
+
+    players[0].score = 500
+    results = players.query("score > 400")
+    assert len(results) == 1
+    assert results[0]._target is players[0]._target
+
+
+def test_slots_are_collected_across_mro():
+    mgr = MirageManager()
+    mirror([SlottedHero("Arthur", 10, 5)], manager=mgr)
+
+    # private slots are skipped, inherited slots come first
+    assert mgr.tables["slottedhero"] == ["name", "score", "level"]
+
+
+def test_unset_slot_syncs_as_null():
+    mgr = MirageManager()
+    hero = SlottedHero("Gwen", 80, 3)
+    del hero.level
+    mgr.sync_object(hero)
+
+    row = mgr.conn.execute("SELECT name, level FROM slottedhero").fetchone()
+    assert row["name"] == "Gwen"
+    assert row["level"] is None
+
+
+def test_namedtuple_is_mirrored_without_weakrefs():
+    mgr = MirageManager()
+    points = mirror([Point("a", 1, 2), Point("b", 5, 6)], manager=mgr)
+
+    assert mgr.tables["point"] == ["label", "x", "y"]
+    results = points.query("label = 'b'")
+    assert len(results) == 1
+    assert results[0]._target is points[1]._target
+
+
+def test_attrs_style_class_uses_declared_attributes():
+    mgr = MirageManager()
+    mirror([AttrsLike("Sword", 15)], manager=mgr)
+
+    assert mgr.tables["attrslike"] == ["title", "price"]
+
+
+def test_single_column_extractor():
+    Tag = namedtuple("Tag", ["label"])
+    mgr = MirageManager()
+    tags = mirror([Tag("red"), Tag("blue")], manager=mgr)
+
+    assert len(tags.query("label = 'blue'")) == 1
+
+
+def test_attrs_private_attributes_are_skipped():
+    class PrivateAttrs(AttrsLike):
+        __attrs_attrs__ = AttrsLike.__attrs_attrs__ + (FakeAttribute("_hidden"),)
+
+        def __init__(self, title, price):
+            super().__init__(title, price)
+            self._hidden = 1
+
+    mgr = MirageManager()
+    mirror([PrivateAttrs("Sword", 15)], manager=mgr)
+
+    assert mgr.tables["privateattrs"] == ["title", "price"]
+
+
+def test_discarded_collection_releases_pinned_objects():
+    import gc
+    mgr = MirageManager()
+    points = mirror([Point("a", 1, 2)], manager=mgr)
+    assert len(mgr._pinned) == 1
+
+    del points
+    gc.collect()
+    assert mgr._pinned == {}
@@ -0,0 +1,133 @@
+import pytest
+from dataclasses import dataclass
+from mirage_sql import mirror
+from mirage_sql.core import MirageManager
+
+
+@dataclass
+class Player:
+    id: int
+    name: str
+    score: int
+
+
+@dataclass
+class Item:
+    name: str
+    owner_id: int
+
+
+@pytest.fixture
+def mgr():
+    return MirageManager()
+
+
+def test_sibling_mirrors_do_not_leak(mgr):
+    red = mirror([Player(1, "Alice", 100), Player(2, "Bob", 200)], manager=mgr)
+    blue = mirror([Player(3, "Carol", 300)], manager=mgr)
+
+    assert sorted(p.name for p in red.query("score > 0")) == ["Alice", "Bob"]
+    assert [p.name for p in blue.query("score > 0")] == ["Carol"]
+    assert blue.first(order_by="score").name == "Carol"
+
+
+def test_join_is_scoped(mgr):
+    players = mirror([Player(1, "Alice", 100)], manager=mgr)
+    items = mirror([Item("Sword", 1)], manager=mgr)
+    mirror([Item("Other Sword", 1)], manager=mgr)
+
+    matches = players.join(items, "player.id = item.owner_id")
+    assert [i.name for _, i in matches] == ["Sword"]
+
+
+def test_aggregates_are_scoped(mgr):
+    red = mirror([Player(1, "Alice", 100), Player(2, "Bob", 200)], manager=mgr)
+    mirror([Player(3, "Carol", 300)], manager=mgr)
+
+    assert red.count_where() == 2
+    assert red.count_where("score > 150") == 1
+    assert red.aggregate("SUM(score)") == 300
+    assert red.aggregate("MIN(score), MAX(score)") == (100, 200)
+
+
+def test_proxy_write_keeps_scope_and_key(mgr):
+    red = mirror([Player(1, "Alice", 100)], manager=mgr)
+    party = mirror({"tank": Player(2, "Bob", 200)}, manager=mgr)
+
+    red[0].score = 150
+    party["tank"].score = 250
+
+    assert [p.score for p in red.query()] == [150]
+    assert [p.name for p in party.query("key_val = 'tank'")] == ["Bob"]
+
+
+def test_drop_collection(mgr):
+    red = mirror([Player(1, "Alice", 100), Player(2, "Bob", 200)], manager=mgr, searchable=["name"])
+    blue = mirror([Player(3, "Carol", 300)], manager=mgr)
+
+    red.drop()
+
+    assert len(red) == 0
+    assert red.count_where() == 0
+    assert red.search("Alice") == []
+    assert mgr.conn.execute("SELECT COUNT(*) FROM player").fetchone()[0] == 1
+    assert [p.name for p in blue.query()] == ["Carol"]
+
+
+def test_list_count_keeps_list_semantics(mgr):
+    red = mirror([Player(1, "Alice", 100), Player(2, "Bob", 200)], manager=mgr)
+
+    assert red.count(red[0]) == 1
+
+
+def test_join_same_class(mgr):
+    red = mirror([Player(1, "Alice", 100), Player(2, "Bob", 200)], manager=mgr)
+    blue = mirror([Player(3, "Carol", 200)], manager=mgr)
+
+    matches = red.join(blue, "player.score = other.score")
+    assert [(r.name, b.name) for r, b in matches] == [("Bob", "Carol")]
+
+
+def test_object_in_two_live_collections_raises(mgr):
+    red = mirror([Player(1, "Alice", 100), Player(2, "Bob", 200)], manager=mgr)
+    blue = mirror([Player(3, "Carol", 300)], manager=mgr)
+
+    with pytest.raises(ValueError):
+        blue.append(red[0])
+    assert len(blue) == 1
+    assert red.count_where("name = 'Alice'") == 1
+
+    with pytest.raises(ValueError):
+        mirror([red[1]], manager=mgr)
+
+
+def test_object_from_discarded_collection_can_be_reused(mgr):
+    import gc
+    alice = Player(1, "Alice", 100)
+    mirror([alice], manager=mgr)
+    gc.collect()
+
+    again = mirror([alice], manager=mgr)
+    assert [p.name for p in again.query()] == ["Alice"]
+
+
+def test_write_after_removal_does_not_resurrect_row(mgr):
+    import gc
+
+    class Slotted:
+        __slots__ = ("name", "score")
+
+        def __init__(self, name, score):
+            self.name = name
+            self.score = score
+
+    db = mirror([Slotted("a", 1), Slotted("b", 2)], manager=mgr)
+    popped = db.pop(0)
+    popped.score = 5
+
+    assert mgr.conn.execute("SELECT COUNT(*) FROM slotted").fetchone()[0] == 1
+    assert [p.name for p in db.query()] == ["b"]
+
+    del db
+    gc.collect()
+    assert mgr._pinned == {}
@@ -0,0 +1,87 @@
+import pytest
+from dataclasses import dataclass
+from mirage_sql import mirror
+from mirage_sql.core import MirageManager
+
+
+@dataclass
+class Member:
+    name: str
+    bio: str
+    age: int
+
+
+@pytest.fixture
+def members():
+    return [
+        Member("Alice Smith", "plays chess", 30),
+        Member("Malice Jones", "smith by trade", 45),
+        Member("Bob Stone", "likes chess and go", 25),
+    ]
+
+
+def test_substring_search(members):
+    db = mirror(members, manager=MirageManager(), searchable=["name"])
+
+    assert sorted(m.name for m in db.search("lice")) == ["Alice Smith", "Malice Jones"]
+    assert [m.name for m in db.search("SMITH")] == ["Alice Smith"]
+    assert db.search("lice")[0]._target in members
+
+
+def test_search_with_where_and_limit(members):
+    db = mirror(members, manager=MirageManager(), searchable=["name", "bio"])
+
+    assert [m.name for m in db.search("chess", where="age < 28")] == ["Bob Stone"]
+    assert len(db.search("chess", limit=1)) == 1
+
+
+def test_where_on_searchable_column(members):
+    db = mirror(members, manager=MirageManager(), searchable=["name", "bio"])
+
+    assert [m.name for m in db.search("smith", where="name LIKE 'A%'")] == ["Alice Smith"]
+    assert sorted(m.name for m in db.search("smith", where="bio <> ''", rank=True)) == ["Alice Smith", "Malice Jones"]
+
+
+def test_search_rank(members):
+    db = mirror(members, manager=MirageManager(), searchable=["name", "bio"])
+
+    db.append(Member("Smith Smithson", "smith smith", 50))
+    db.append(Member("Zed", "a long biography mentioning a blacksmith once among many other words", 60))
+
+    # bm25: repeated hits in short text beat a single hit diluted in long text
+    ranked = [m.name for m in db.search("smith", rank=True)]
+    assert ranked[0] == "Smith Smithson"
+    assert ranked[-1] == "Zed"
+    assert len(ranked) == 4
+
+
+def test_search_tracks_writes(members):
+    db = mirror(members, manager=MirageManager(), searchable=["name"])
+
+    db[2].name = "Bobby Tables"
+    assert db.search("Stone") == []
+    assert [m.name for m in db.search("Tables")] == ["Bobby Tables"]
+
+    db.append(Member("Tabitha", "", 50))
+    assert sorted(m.name for m in db.search("Tab")) == ["Bobby Tables", "Tabitha"]
+
+    db.pop(0)
+    assert [m.name for m in db.search("lice")] == ["Malice Jones"]
+
+
+def test_short_terms_fall_back_to_scan(members):
+    db = mirror(members, manager=MirageManager(), searchable=["name"])
+
+    assert sorted(m.name for m in db.search("al")) == ["Alice Smith", "Malice Jones"]
+
+
+def test_special_characters_are_literal(members):
+    db = mirror(members + [Member('O"Neil-Smith', "", 1)], manager=MirageManager(), searchable=["name"])
+
+    assert [m.name for m in db.search('O"Neil-')] == ['O"Neil-Smith']
+
+
+def test_search_requires_index(members):
+    db = mirror(members, manager=MirageManager())
+    with pytest.raises(ValueError):
+        db.search("Alice")
@@ -0,0 +1,105 @@
+import math
+import random
+import pytest
+from dataclasses import dataclass
+from mirage_sql import mirror
+from mirage_sql.core import MirageManager
+
+
+@dataclass
+class Unit:
+    name: str
+    x: float
+    y: float
+    team: str = "red"
+
+
+@dataclass
+class Drone:
+    name: str
+    x: float
+    y: float
+    z: float
+
+
+@pytest.fixture
+def units():
+    return [
+        Unit("a", 0.0, 0.0),
+        Unit("b", 1.0, 1.0, "blue"),
+        Unit("c", 5.0, 5.0),
+        Unit("d", 9.5, 0.5),
+    ]
+
+
+def test_within_bbox(units):
+    db = mirror(units, manager=MirageManager(), spatial=["x", "y"])
+
+    found = db.within((0, 0, 2, 2))
+    assert sorted(u.name for u in found) == ["a", "b"]
+    assert found[0]._target in units
+
+    # combined with an ordinary predicate
+    assert [u.name for u in db.within((0, 0, 2, 2), where="team = 'blue'")] == ["b"]
+
+
+def test_proxy_write_moves_point(units):
+    db = mirror(units, manager=MirageManager(), spatial=["x", "y"])
+
+    db[2].x = 1.5
+    db[2].y = 1.5
+    assert sorted(u.name for u in db.within((0, 0, 2, 2))) == ["a", "b", "c"]
+
+    db.pop(0)
+    assert sorted(u.name for u in db.within((0, 0, 2, 2))) == ["b", "c"]
+
+
+def test_appended_items_are_indexed(units):
+    db = mirror(units, manager=MirageManager(), spatial=["x", "y"])
+    db.append(Unit("e", 100.0, 100.0))
+
+    assert [u.name for u in db.within((99, 99, 101, 101))] == ["e"]
+
+
+def test_nearest(units):
+    db = mirror(units, manager=MirageManager(), spatial=["x", "y"])
+
+    assert [u.name for u in db.nearest((4.0, 4.0), k=2)] == ["c", "b"]
+    assert [u.name for u in db.nearest((100.0, 0.0), k=1)] == ["d"]
+    # asking for more than exist returns everything
+    assert len(db.nearest((0.0, 0.0), k=10)) == 4
+    assert [u.name for u in db.nearest((0.0, 0.0), k=1, where="team = 'blue'")] == ["b"]
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(7)
+    raw = [Unit(str(i), rng.uniform(-500, 500), rng.uniform(-500, 500)) for i in range(2000)]
+    db = mirror(raw, manager=MirageManager(), spatial=["x", "y"])
+
+    point = (12.3, -45.6)
+    expected = sorted(raw, key=lambda u: math.dist(point, (u.x, u.y)))[:5]
+    assert [u.name for u in db.nearest(point, k=5)] == [u.name for u in expected]
+
+
+def test_three_dimensions():
+    db = mirror([Drone("low", 0, 0, 1), Drone("high", 0, 0, 50)], manager=MirageManager(), spatial=["x", "y", "z"])
+
+    assert [d.name for d in db.within((-1, -1, 0, 1, 1, 10))] == ["low"]
+    assert [d.name for d in db.nearest((0, 0, 40), k=1)] == ["high"]
+
+
+def test_spatial_errors(units):
+    db = mirror(units, manager=MirageManager())
+    with pytest.raises(ValueError):
+        db.within((0, 0, 1, 1))
+
+    with pytest.raises(ValueError):
+        mirror(units, manager=MirageManager(), spatial=["x", "altitude"])
+
+    db = mirror(units, manager=MirageManager(), spatial=["x", "y"])
+    with pytest.raises(ValueError):
+        db.within((0, 0, 1))
+    with pytest.raises(ValueError):
+        db.nearest((math.nan, 0))
+    with pytest.raises(ValueError):
+        db.nearest((math.inf, 0))